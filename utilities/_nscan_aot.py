@@ -0,0 +1,69 @@
+"""
+Usage:
+    python _nscan_aot.py
+
+N-run scanning kernel used by find_scaffolds.py. Running this file compiles the kernel
+ahead of time with numba.pycc into an 'nscan' extension module next to this script, so
+find_scaffolds.py can import it without paying JIT compilation on startup. When the
+extension has not been built, find_scaffolds.py JIT-compiles the same function instead.
+"""
+
+import os
+import numpy as np
+
+
+################################################################################
+##                           Function Definitions                             ##
+################################################################################
+
+def find_n_runs(buf):
+    """
+    Single-pass scan for runs of 'N'/'n' bytes.
+
+    Args:
+        buf: The sequence as a uint8 array.
+
+    Returns:
+        Two int64 arrays holding the start and end (exclusive) of each run.
+    """
+    starts = np.empty(buf.size // 2 + 1, np.int64)
+    ends = np.empty_like(starts)
+    k = 0
+    in_run = False
+    s = 0
+    for i in range(buf.size):
+        c = buf[i]
+        is_n = (c == 78) | (c == 110)  # 'N' or 'n'
+        if is_n and not in_run:
+            s = i
+            in_run = True
+        elif not is_n and in_run:
+            starts[k] = s
+            ends[k] = i
+            k += 1
+            in_run = False
+    if in_run:
+        starts[k] = s
+        ends[k] = buf.size
+        k += 1
+    return starts[:k], ends[:k]
+
+################################################################################
+##                                  MAIN                                      ##
+################################################################################
+
+def main():
+    from numba import types
+    from numba.pycc import CC
+
+    cc = CC('nscan')
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # Buffers from np.frombuffer(bytes) are read-only
+    buf_type = types.Array(types.uint8, 1, 'C', readonly=True)
+    runs_type = types.Array(types.int64, 1, 'C')
+    cc.export('find_n_runs', types.UniTuple(runs_type, 2)(buf_type))(find_n_runs)
+    cc.compile()
+
+if __name__ == "__main__":
+    main()
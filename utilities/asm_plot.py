@@ -9,10 +9,14 @@ This script reads a tabulated input file and a BED file with genomic regions, pa
 """
 
 import argparse
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import matplotlib.patches as patches
+from matplotlib.collections import PatchCollection
+from functools import lru_cache
 import csv
 import re
+import sys
 
 ref_height  = 0.10
 asm_height  = 0.05
@@ -33,11 +37,12 @@ def parse_tab_line(line):
         line: String containing a single line from the file.
 
     Returns:
-        A dictionary with parsed values including target_name, ref_pos_start, ref_pos_end, and query_name.
+        A (chrom, start, end, query) tuple with parsed values for target_name, ref_pos_start, ref_pos_end, and query_name.
     """
     fields = line.strip().split("\t")
-    target_name, ref_pos_start, ref_pos_end, query_name = fields[3], int(fields[4]), int(fields[5]), fields[0]
-    return {'chrom': target_name, 'start': ref_pos_start, 'end': ref_pos_end, 'query': query_name}
+    # Names repeat across many lines; interning shares one string object and its cached hash
+    target_name, ref_pos_start, ref_pos_end, query_name = sys.intern(fields[3]), int(fields[4]), int(fields[5]), sys.intern(fields[0])
+    return (target_name, ref_pos_start, ref_pos_end, query_name)
 
 def read_tab_file(filename):
     """
@@ -47,7 +52,7 @@ def read_tab_file(filename):
         filename: Path to the input file.
 
     Returns:
-        A list of dictionaries, each containing the parsed line information.
+        A list of (chrom, start, end, query) tuples, each containing the parsed line information.
     """
     data = []
     with open(filename, 'r') as f:
@@ -71,9 +76,26 @@ def read_tsv_to_dict(filename, key_column=0, value_column=1):
 
     with open(filename, mode='r', newline='') as file:
         reader = csv.reader(file, delimiter='\t')
-        result_dict = {rows[key_column]: rows[value_column] for rows in reader if len(rows) >= value_column}
+        result_dict = {sys.intern(rows[key_column]): rows[value_column] for rows in reader if len(rows) >= value_column}
     return result_dict
 
+@lru_cache(maxsize=None)
+def parse_bed_color(value):
+    """
+    Converts a BED itemRgb value into a matplotlib color. Results are cached since BED
+    files typically reuse a handful of colors.
+
+    Args:
+        value: String from the ninth column of a BED line, e.g. '255,0,0'.
+
+    Returns:
+        An RGB tuple normalized to [0, 1], or 'grey' if the value cannot be parsed.
+    """
+    color_values = value.split(',')
+    if len(color_values) == 3:
+        return tuple(int(c) / 255.0 for c in color_values)  # Normalize to [0, 1]
+    return 'grey'  # Default color if parsing fails
+
 def parse_bed_line(line):
     """
     Parses a single line from the input BED file.
@@ -84,21 +106,20 @@ def parse_bed_line(line):
     Returns:
         A dictionary with parsed values including chrom, start, end, type, and color.
     """
-    fields = line.strip().split("\t")
-    chrom, start, end, name = fields[0], int(fields[1]), int(fields[2]), fields[3]
+    # Split off only the coordinates first; most regions fail the size filter below
+    chrom, start, end, rest = line.strip().split("\t", 3)
+    start, end = int(start), int(end)
     # Calculate the size of the region and filter out if less than 100,000 bp
     size = end - start
     if size < 100000:
         return None  # Skip regions smaller than 100,000 bp
 
-    type = re.split('_|\(', name)[0]  # Extract the type from the fourth column
-    color_values = fields[8].split(',')  # Expecting RGB color in the ninth column
-    if len(color_values) == 3:
-        color = tuple(int(c) / 255.0 for c in color_values)  # Normalize to [0, 1]
-    else:
-        color = 'grey'  # Default color if parsing fails
-    
-    return {'chrom': chrom, 'start': start, 'end': end, 'type': type, 'color': color}
+    fields = rest.split("\t")
+    name = fields[0]
+    type_ = name.partition('_')[0].partition('(')[0]  # Extract the type from the fourth column
+    color = parse_bed_color(fields[5])  # Expecting RGB color in the ninth column
+
+    return {'chrom': chrom, 'start': start, 'end': end, 'type': type_, 'color': color}
 
 
 
@@ -122,6 +143,22 @@ def read_bed_file(filename):
                     regions.append(parsed_line)
     return regions
 
+def add_rectangle_collection(ax, rects, colors):
+    """
+    Adds rectangles to the axes as a single PatchCollection, drawn in the given order.
+
+    Args:
+        ax: The matplotlib axes to draw on.
+        rects: List of (x, y, width, height) tuples.
+        colors: List with the color of each rectangle.
+    """
+    if not rects:
+        return
+    pc = PatchCollection([patches.Rectangle((x, y), w, h) for x, y, w, h in rects],
+                         facecolors=colors, edgecolors=colors, joinstyle='miter')
+    pc.set_rasterized(True)  # Keep vector outputs (pdf/svg) small; axes and text stay vector
+    ax.add_collection(pc)
+
 # Predefined dictionary for chromosome names and their sizes in base pairs
 REFERENCE_CHROMOSOMES = {
     "chr1": 248387328, "chr2": 242696752, "chr3": 201105948, "chr4": 193574945,
@@ -133,7 +170,11 @@ REFERENCE_CHROMOSOMES = {
     "chrM": 16569
 }
 
-def plot_data(alignment_files, color_files, regions, output_file):
+# Chromosome display order (top to bottom) and y-axis positions, computed once
+CHROM_ORDER = sorted(REFERENCE_CHROMOSOMES, key=natural_sort_key, reverse=True)
+CHROM_Y_POSITIONS = {chrom: i for i, chrom in enumerate(CHROM_ORDER, start=1)}
+
+def plot_data(alignment_files, color_files, regions, output_file, dpi=150):
     """
     Plots the parsed data and regions using matplotlib, saving the plot to an output file.
 
@@ -141,51 +182,61 @@ def plot_data(alignment_files, color_files, regions, output_file):
         alignment_files: List of paths to the input tabulated files.
         regions: List of dictionaries containing parsed line information from the BED file.
         output_file: Path to the output file.
+        dpi: Resolution of the saved figure (default: 150).
     """
+    if len(color_files) < len(alignment_files):
+        raise ValueError(f"Expected a color file for each alignment file, got {len(alignment_files)} "
+                         f"alignment files and only {len(color_files)} color files")
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    # Use a standalone Figure rather than pyplot's global state
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
 
-    # Sort chromosome names from the predefined reference set
-    chroms = sorted(REFERENCE_CHROMOSOMES.keys(), key=natural_sort_key, reverse=True)
-    chrom_y_positions = {chrom: i for i, chrom in enumerate(chroms, start=1)}
+    chroms = CHROM_ORDER
+    chrom_y_positions = CHROM_Y_POSITIONS
 
     # Plot chromosomes as black lines based on their known sizes
     for chrom, y_pos in chrom_y_positions.items():
-        if chrom in REFERENCE_CHROMOSOMES:
-            chrom_length = REFERENCE_CHROMOSOMES[chrom]
-            ax.add_patch(patches.Rectangle((0, y_pos - ref_height/2), chrom_length, ref_height, color='black', alpha=0.6))
+        chrom_length = REFERENCE_CHROMOSOMES[chrom]
+        ax.add_patch(patches.Rectangle((0, y_pos - ref_height/2), chrom_length, ref_height, color='black', alpha=0.6))
 
     # Plot regions from the BED file on top of the chromosomes
+    region_rects, region_colors = [], []
     for r in regions:
-        if r['chrom'] in REFERENCE_CHROMOSOMES:
+        y_position = chrom_y_positions.get(r['chrom'])
+        if y_position is not None:
             x_position = r['start']
             width = r['end'] - r['start']
-            y_position = chrom_y_positions[r['chrom']]
-            rect = patches.Rectangle((x_position, y_position - ref_height/2), width, ref_height, color=r['color'])
-            ax.add_patch(rect)
+            region_rects.append((x_position, y_position - ref_height/2, width, ref_height))
+            region_colors.append(r['color'])
+    add_rectangle_collection(ax, region_rects, region_colors)
 
     # Initialize a vertical offset for the first set of alignments
     vertical_offset = asm_spacing
 
     # Plot alignments from each file at a unique height
+    alignment_rects, alignment_colors = [], []
     for i in range(len(alignment_files)):
         data         = read_tab_file(alignment_files[i])
         color_lookup = read_tsv_to_dict(color_files[i])
 
-        for d in data:
-            if d['chrom'] in REFERENCE_CHROMOSOMES:
-                query_name = d['query']
+        for chrom, start, end, query_name in data:
+            chrom_y = chrom_y_positions.get(chrom)
+            if chrom_y is not None:
                 color_val  = color_lookup[query_name]
 
-                x_position = d['start']
-                width = d['end'] - d['start']
-                y_position = chrom_y_positions[d['chrom']] + vertical_offset
-                rect = patches.Rectangle((x_position, y_position), width, asm_height, color=color_val)
-                ax.add_patch(rect)
+                x_position = start
+                width = end - start
+                y_position = chrom_y + vertical_offset
+                alignment_rects.append((x_position, y_position, width, asm_height))
+                alignment_colors.append(color_val)
 
         # Increment the vertical offset for the next file's alignments
         vertical_offset += asm_spacing
 
+    add_rectangle_collection(ax, alignment_rects, alignment_colors)
+
     # Set plot parameters
     max_bp_length = max(REFERENCE_CHROMOSOMES.values())
     ax.set_xlim(0, max_bp_length)
@@ -194,10 +245,10 @@ def plot_data(alignment_files, color_files, regions, output_file):
     ax.set_yticklabels(chroms)
     ax.set_xlabel('Position')
     ax.set_ylabel('Chromosome')
-    plt.tight_layout()
+    fig.tight_layout()
 
     # Save the plot to file
-    plt.savefig(output_file, dpi=600)
+    fig.savefig(output_file, dpi=dpi)
 
 
 ################################################################################
@@ -207,7 +258,7 @@ def plot_data(alignment_files, color_files, regions, output_file):
 def main(args):
 
     regions = read_bed_file(args.bed_file) if args.bed_file else []
-    plot_data(args.input_files, args.color_files, regions, args.output_file)    
+    plot_data(args.input_files, args.color_files, regions, args.output_file, args.dpi)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Visualize multiple genomic alignments with BED file regions.")
@@ -215,6 +266,7 @@ if __name__ == "__main__":
     parser.add_argument("--color_files", nargs="+", type=str, required=True, help="Paths to tsv file with colors for query/contig names")
     parser.add_argument("--bed_file", type=str, help="Path to the BED file with genomic regions (optional).")
     parser.add_argument("--output_file", type=str, required=True, help="Path to the output plot file.")
+    parser.add_argument("--dpi", type=int, default=150, help="Resolution of the output plot (default: 150, use 600 for publication).")
     args = parser.parse_args()
 
     main(args)
@@ -1,7 +1,44 @@
 import argparse
 import gzip
+import importlib.machinery
+import importlib.util
+import os
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import re
-from Bio import SeqIO
+
+def _load_local_module(name):
+    """
+    Imports a module that sits next to this script, independent of sys.path.
+
+    Args:
+        name: Module name, e.g. '_nscan_aot'.
+
+    Returns:
+        The module, or None if no such module exists next to this script.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.machinery.PathFinder.find_spec(name, [os.path.dirname(os.path.abspath(__file__))])
+    if spec is None:
+        return None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Without numpy, scan with the bytes regex below
+
+# Ahead-of-time build, see _nscan_aot.py
+_nscan = _load_local_module('nscan') if np is not None else None
+
+# Byte-level pattern; the character class covers both cases without re.IGNORECASE
+_N_RUN_RE = re.compile(rb'[Nn]+')
 
 """
 Usage:
@@ -11,6 +48,11 @@ Example:
     python find_scaffolds.py --fasta_file genome.fasta --bed_file scaffolds.bed
 
 Parse FASTA(.gz) file and outpu BED file which represent stretches of 'N' characters.
+
+Records are scanned on a thread pool with a JIT-compiled N-run scanner, which releases
+the GIL. Running `python _nscan_aot.py` once builds a precompiled scanner; it holds the
+GIL, so it is only used for single-threaded scans (one CPU, or numba not installed),
+where it saves the JIT start-up cost.
 """
 
 
@@ -18,47 +60,124 @@ Parse FASTA(.gz) file and outpu BED file which represent stretches of 'N' charac
 ##                           Function Definitions                             ##
 ################################################################################
 
-def find_scaffolds(sequence, chrom_name):
+def iter_fasta(filename):
+    """
+    Streams records from a FASTA(.gz) file without building intermediate sequence objects.
+
+    Args:
+        filename: Path to the FASTA file.
+
+    Yields:
+        Tuples of (chrom_name, sequence) where sequence is the raw bytes of the record.
+    """
+    open_func = gzip.open if filename.endswith('.gz') else open
+    with open_func(filename, 'rb') as f:
+        name = None
+        chunks = []
+        for line in f:
+            if line.startswith(b'>'):
+                if name is not None:
+                    yield name, b''.join(chunks)
+                name = (line[1:].split() or [b''])[0].decode()
+                chunks = []
+            else:
+                chunks.append(line.strip())
+        if name is not None:
+            yield name, b''.join(chunks)
+
+@lru_cache(maxsize=None)
+def _jit_find_n_runs():
+    """
+    Compiles the N-run kernel from _nscan_aot.py with Numba, releasing the GIL while it runs.
+
+    Returns:
+        The JIT-compiled kernel, or None if numpy or numba is not installed.
+    """
+    if np is None:
+        return None
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True, nogil=True)(_load_local_module('_nscan_aot').find_n_runs)
+
+def _serial_find_n_runs():
+    """
+    Picks the N-run kernel for single-threaded scans: the AOT build if present, since it
+    needs no compilation, otherwise the JIT kernel.
+
+    Returns:
+        The kernel, or None if neither is available.
+    """
+    if _nscan is not None:
+        return _nscan.find_n_runs
+    return _jit_find_n_runs()
+
+def find_scaffolds(sequence, chrom_name, find_n_runs=None):
     """
     Identifies the positions of 'N' characters in a genomic sequence.
 
     Args:
-        sequence: The genomic sequence as a Biopython Seq object.
+        sequence: The genomic sequence as a bytes buffer or a Biopython Seq object.
         chrom_name: The name of the chromosome or contig.
+        find_n_runs: N-run kernel to scan with (default: the one for single-threaded scans).
+            Falls back to a bytes regex when no kernel is available.
 
     Returns:
         A list of tuples, each representing the start and end positions of a scaffold.
     """
-    scaffolds = []
-    pattern = re.compile('N+', re.IGNORECASE)  
+    if not isinstance(sequence, (bytes, bytearray, memoryview)):
+        sequence = bytes(sequence)  # Seq.__bytes__ hands back its stored ASCII data, no str round-trip
 
-    sequence_str = str(sequence)
+    if find_n_runs is None:
+        find_n_runs = _serial_find_n_runs()
 
-    for match in pattern.finditer(sequence_str):
-        start, end = match.start(), match.end()
-        scaffolds.append((chrom_name, start, end))
+    if find_n_runs is None:
+        return [(chrom_name, match.start(), match.end()) for match in _N_RUN_RE.finditer(sequence)]
 
-    return scaffolds
+    buf = np.frombuffer(sequence, dtype=np.uint8)
+    starts, ends = find_n_runs(buf)
 
-def read_fasta_file(filename):
+    return list(zip([chrom_name] * len(starts), starts.tolist(), ends.tolist()))
+
+def read_fasta_file(filename, max_workers=None):
     """
-    Reads a FASTA file using Biopython and processes each sequence to find scaffolds.
+    Reads a FASTA file and processes each sequence to find scaffolds.
+    With more than one worker, sequences are scanned concurrently on a thread pool using the
+    JIT-compiled kernel, which releases the GIL. With a single worker, or without numba,
+    sequences are scanned one at a time, using the AOT build when it is present.
 
     Args:
         filename: Path to the FASTA file.
+        max_workers: Number of scanning threads (default: number of CPUs, capped at 8).
+            Up to this many whole sequences, plus the one being read, are held in memory
+            at once, each alongside its scan output arrays.
 
     Returns:
         A list of all scaffolds found in all sequences within the file.
     """
     all_scaffolds = []
 
-    open_func = gzip.open if filename.endswith('.gz') else open
-    with open_func(filename, 'rt') as f:
-        for record in SeqIO.parse(f, "fasta"):
-            chrom_name = record.id
-            sequence = record.seq
+    # Every worker holds a whole contig, so the default stays small even on many-core hosts
+    max_workers = max_workers or min(os.cpu_count() or 1, 8)
+
+    # Only the JIT kernel releases the GIL, so it is the one spread over threads
+    find_n_runs = _jit_find_n_runs() if max_workers > 1 else None
+    if find_n_runs is None:
+        for chrom_name, sequence in iter_fasta(filename):
             scaffolds = find_scaffolds(sequence, chrom_name)
             all_scaffolds.extend(scaffolds)
+        return all_scaffolds
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for chrom_name, sequence in iter_fasta(filename):
+            pending.append(executor.submit(find_scaffolds, sequence, chrom_name, find_n_runs))
+            # Bound the number of sequences held in memory at once
+            if len(pending) >= max_workers:
+                all_scaffolds.extend(pending.popleft().result())
+        while pending:
+            all_scaffolds.extend(pending.popleft().result())
 
     return all_scaffolds
 
@@ -84,7 +203,7 @@ def main(args):
     write_bed_file(scaffolds, args.bed_file)
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Find scaffolds in FASTA sequences using Biopython and output their positions in a BED file.")
+    parser = argparse.ArgumentParser(description="Find scaffolds in FASTA sequences and output their positions in a BED file.")
     parser.add_argument("--fasta_file", type=str, required=True, help="Path to the input FASTA file.")
     parser.add_argument("--bed_file", type=str, required=True, help="Path to the output BED file.")
 
@@ -11,10 +11,32 @@ Example:
     python parse_paf.py --paf_file alignments.paf --min_length 100000 --output_file filtered_alignments.txt
 """
 
+# Output columns, in the order parse_paf_line returns them
+PAF_COLUMNS = ('query_name', 'query_start', 'query_end', 'target_name',
+               'ref_pos_start', 'ref_pos_end', 'ref_seq_len', 'tp', 'de')
+
 ################################################################################
 ##                           Function Definitions                             ##
 ################################################################################
 
+def find_tag(tags, prefix):
+    """
+    Looks up an optional field in the tab-joined optional fields of a PAF line.
+
+    Args:
+        tags: The optional fields of a PAF line, each preceded by a tab.
+        prefix: Tab, tag and type of the field to find, e.g. '\ttp:A:'.
+
+    Returns:
+        The value of the last matching field, or None if there is none.
+    """
+    start = tags.rfind(prefix)
+    if start < 0:
+        return None
+    start += len(prefix)
+    end = tags.find('\t', start)
+    return tags[start:end] if end >= 0 else tags[start:]
+
 def parse_paf_line(line, min_length=100000):
     """
     Parses a single line from a PAF file, filtering based on minimum length.
@@ -24,82 +46,62 @@ def parse_paf_line(line, min_length=100000):
         min_length: Minimum alignment length (default: 100000).
 
     Returns:
-        A dictionary containing relevant information from the PAF line if it meets the
-        minimum length criteria, otherwise None.
+        A tuple of the PAF_COLUMNS values from the PAF line if it meets the minimum
+        length criteria and is a primary/inversion alignment, otherwise None.
     """
-    fields = line.strip().split("\t")
+    # The 12 mandatory fields, with all optional fields left together in fields[12]
+    # See PAF spec @ https://github.com/lh3/miniasm/blob/master/PAF.md
+    fields = line.strip().split("\t", 12)
     if len(fields) < 12 or int(fields[9]) < min_length:
         return None
 
-    # Extracting fields and optional tags for further processing
-    # See PAF spec @ https://github.com/lh3/miniasm/blob/master/PAF.md
-    parsed_line = {
-        'query_name': fields[0],
-        'query_start': fields[2],
-        'query_end': fields[3],
-        'target_name': fields[5],
-        'ref_pos_start': fields[7],
-        'ref_pos_end': fields[8],
-        'ref_seq_len': fields[6],
-        'tp': None,  # Type of alignment
-        'de': None,  # Sequence divergence
-    }
-
-    # Parsing optional fields for 'tp' and 'de'
-    for field in fields[12:]:
-        tag, _, value = field.split(':')
-        if tag == 'tp':
-            parsed_line['tp'] = value
-        elif tag == 'de':
-            parsed_line['de'] = value
+    # Parsing optional fields for 'tp' (type of alignment) and 'de' (sequence divergence)
+    tags = '\t' + fields[12] if len(fields) > 12 else ''
+    tp = find_tag(tags, '\ttp:A:')
+    de = find_tag(tags, '\tde:f:')
 
     # Filtering non-primary/secondary alignments
-    if parsed_line['tp'] not in ['P', 'I'] or parsed_line['de'] is None:
+    if (tp != 'P' and tp != 'I') or de is None:
         return None
 
-    return parsed_line
+    return (fields[0], fields[2], fields[3], fields[5], fields[7], fields[8], fields[6], tp, de)
 
 
 def read_paf(filename, min_length=100000):
     """
-    Reads a PAF file and returns a list of parsed alignments.
+    Reads a PAF file and yields parsed alignments one line at a time.
 
     Args:
         filename: Path to the PAF file.
         min_length: Minimum alignment length (default: 100000).
 
-    Returns:
-        A list of dictionaries, where each dictionary contains parsed information from
-        a valid alignment line in the PAF file.
+    Yields:
+        A tuple with the values of PAF_COLUMNS for each valid alignment line in the PAF file.
     """
-    alignments = []
     with open(filename, 'r') as f:
         for line in f:
             parsed_line = parse_paf_line(line, min_length)
             if parsed_line:
-                alignments.append(parsed_line)
-    return alignments
+                yield parsed_line
 
 
 def print_lines_to_file(alignments, output_file):
     """
-    Prints all elements of alignments along with a header line to a specified file.
+    Prints all alignments along with a header line to a specified file, writing each
+    alignment as it arrives.
 
     Args:
-        alignments: List of dictionaries containing parsed information from alignments.
+        alignments: Iterable of tuples with the values of PAF_COLUMNS, e.g. from read_paf.
         output_file: Path to the file where the output will be written.
     """
+    alignments = iter(alignments)
+    first = next(alignments, None)
 
     with open(output_file, 'w') as f:
-        if alignments:
-            # Generate header from dictionary keys
-            header = '\t'.join(list(alignments[0].keys()))  + '\n'
-            f.write(header)
-
-            # Iterate over each alignment and print its values along with the label
-            for alignment in alignments:
-                line = '\t'.join(str(value) for value in alignment.values()) + '\n'
-                f.write(line)
+        if first is not None:
+            f.write('\t'.join(PAF_COLUMNS) + '\n')
+            f.write('\t'.join(first) + '\n')
+            f.writelines('\t'.join(alignment) + '\n' for alignment in alignments)
 
 
 